@@ -1,10 +1,15 @@
 
-from contextlib import contextmanager
-from typing import List
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, List
 
 from sqlalchemy import create_engine, exc, inspect, text
+from sqlalchemy.sql.elements import TextClause
 
-from .records import Collection, Record
+from .records import Collection, _records
+
+# The number of rows fetched from the driver at a time when iterating over query results.
+FETCH_BATCH_SIZE = 1000
 
 
 class Connection:
@@ -23,7 +28,7 @@ class Connection:
     def execute(self, query: str, **params):
         """Executes the given SQL query against the db. Parameters may be provided using the `:param` syntax. If
         you expect your query to return result rows, please use query."""
-        self._conn.execute(text(query), **params)
+        _execute(self._conn, query, params)
 
     def transaction(self):
         """Returns a transaction on which to run queries. Call commit and rollback as appropriate."""
@@ -32,11 +37,7 @@ class Connection:
     def query(self, query: str, **params) -> Collection:
         """Executes the given SQL query against the db. Parameters may be provided using `:param` syntax. Returns
         a Collection of Records which can be iterated over to get resulting Records."""
-        cursor = self._conn.execute(text(query), **params)
-
-        # Create a row-by-row Record generator and convert results into a Collection.
-        record_generator = (Record(list(cursor.keys()), row) for row in cursor)
-        return Collection(record_generator)
+        return _query(self._conn, query, params)
 
     # TODO: bulk_query
 
@@ -53,54 +54,58 @@ class Connection:
 class Database:
     """A real db. This holds a connection url and the SQLAlchemy engine with a pool of connections."""
 
-    __slots__ = ("url", "open", "_engine")
+    __slots__ = ("url", "open", "_engine", "_inspector")
 
     def __init__(self, url: str, **kwargs):
         self.url = url
         self._engine = create_engine(self.url, **kwargs)
+        self._inspector = None
         self.open = True
 
     def close(self):
         """Closes the db, disposes of the engine."""
         self._engine.dispose()
+        self._inspector = None
         self.open = False
 
     def execute(self, query: str, **params):
         """Executes the given SQL query against the db. Parameters may be provided using the `:param` syntax. If
         you expect your query to return result rows, please use query."""
-        with self.get_connection() as conn:
-            conn.execute(query, **params)
+        with self._connect() as conn:
+            _execute(conn, query, params)
 
     def get_connection(self) -> Connection:
         """Gets a connection to the db. Connections are retrieved from a pool."""
-        if not self.open:
-            raise exc.ResourceClosedError("db closed")
-        return Connection(self._engine.connect())
+        return Connection(self._connect())
 
     def query(self, query: str, **params) -> Collection:
         """Executes the given SQL query against the db. Parameters may be provided using `:param` syntax. Returns
         a Collection of Records which can be iterated over to get resulting Records."""
-        with self.get_connection() as conn:
-            return conn.query(query, **params)
+        with self._connect() as conn:
+            return _query(conn, query, params)
 
     # TODO: bulk_query
 
     def tables(self) -> List[str]:
         """Returns a list of table names for the connected db."""
-        return inspect(self._engine).get_table_names()
-
-    @contextmanager
-    def transaction(self) -> Connection:
-        """A context manager for executing queries within transactions on the db."""
-        conn = self.get_connection()
-        tx = conn.transaction()
-        try:
-            yield conn
-            tx.commit()
-        except:
-            tx.rollback()
-        finally:
-            conn.close()
+        # Creating an inspector checks out a connection, so keep one around. Its reflection cache is cleared on every
+        # call though, since tables may have been created or dropped in the meantime.
+        if self._inspector is None:
+            self._inspector = inspect(self._engine)
+        else:
+            self._inspector.info_cache.clear()
+        return self._inspector.get_table_names()
+
+    def transaction(self) -> "_TransactionContext":
+        """A context manager for executing queries within transactions on the db. The transaction is committed when
+        the block exits normally, and rolled back if it raises (the exception is propagated)."""
+        return _TransactionContext(self)
+
+    def _connect(self):
+        """Gets a raw sqlalchemy connection from the pool, for one-shot queries that don't need a Connection."""
+        if not self.open:
+            raise exc.ResourceClosedError("db closed")
+        return self._engine.connect()
 
     def __enter__(self):
         return self
@@ -110,3 +115,52 @@ class Database:
 
     def __repr__(self):
         return f"<Database open={self.open}>"
+
+
+class _TransactionContext:
+    """Runs the body of a `with` block in a transaction on a fresh Connection, returned by Database.transaction."""
+
+    __slots__ = ("_db", "_conn", "_tx")
+
+    def __init__(self, db: Database):
+        self._db = db
+        self._conn = None
+        self._tx = None
+
+    def __enter__(self) -> Connection:
+        self._conn = self._db.get_connection()
+        self._tx = self._conn.transaction()
+        return self._conn
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self._tx.commit()
+            else:
+                self._tx.rollback()
+        finally:
+            self._conn.close()
+        return False
+
+
+@lru_cache(maxsize=256)
+def _text(query: str) -> TextClause:
+    """Returns the TextClause for the given SQL query. Text clauses are immutable, so repeated queries reuse one
+    rather than parsing the SQL again."""
+    return text(query)
+
+
+def _execute(conn, query: str, params: Dict[str, Any]):
+    """Executes the given SQL query on a sqlalchemy connection, discarding any results."""
+    conn.execute(_text(query), **params)
+
+
+def _query(conn, query: str, params: Dict[str, Any]) -> Collection:
+    """Executes the given SQL query on a sqlalchemy connection and returns a Collection of the resulting Records."""
+    cursor = conn.execute(_text(query), **params)
+
+    # Create a Record generator and convert results into a Collection. The keys are fetched once and shared by every
+    # Record in the result set, and rows are pulled from the driver in batches rather than one at a time.
+    keys = tuple(cursor.keys())
+    rows = chain.from_iterable(cursor.partitions(FETCH_BATCH_SIZE))
+    return Collection(_records(keys, rows))
@@ -1,19 +1,25 @@
-
-from collections import OrderedDict
+from datetime import date, datetime, time
 from inspect import isclass
-from typing import Any, Dict, Iterator, List, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+from tablib import Dataset, InvalidDimensions
 
-from tablib import Dataset
+# The value types which are converted to ISO 8601 strings on export.
+_DT_TYPES = (date, datetime, time)
 
 
 class Record:
     """A single record resulting from a db query."""
-    __slots__ = ('_keys', '_values')
+    __slots__ = ('_keys', '_values', '_index', '_dups', '_dict_cache')
 
-    def __init__(self, keys: List[str], values: List[Any]):
-        self._keys = keys
-        self._values = values
-        assert len(self._keys) == len(self._values), "record must have the same number of keys as values"
+    def __init__(self, keys: Iterable[str], values: Iterable[Any], *, _index: Dict[str, int] = None,
+                 _dups: Set[str] = None):
+        self._keys = keys if isinstance(keys, tuple) else tuple(keys)
+        self._values = values if isinstance(values, tuple) else tuple(values)
+        # A key -> index lookup table may be shared by Records with the same keys; otherwise it's built on first use.
+        self._index = _index
+        self._dups = _dups
+        self._dict_cache = None
 
     @property
     def dataset(self) -> Dataset:
@@ -24,9 +30,12 @@ class Record:
         return ds
 
     def dict(self, *, ordered=False) -> Dict[str, Any]:
-        """Returns the record as a dictionary. If ordered==True, the dictionary will be an OrderedDict."""
-        items = zip(self.keys(), self.values())
-        return OrderedDict(items) if ordered else dict(items)
+        """Returns the record as a dictionary, in column order. The ordered flag is kept for compatibility only, since
+        plain dicts preserve insertion order."""
+        # Build the mapping once; callers get their own copy so mutating it doesn't affect the Record.
+        if self._dict_cache is None:
+            self._dict_cache = dict(zip(self._keys, self._values))
+        return dict(self._dict_cache)
 
     def export(self, format: str, **kwargs) -> Any:
         """Exports the row into the given format (Thanks, Tablib!)"""
@@ -34,28 +43,43 @@ class Record:
 
     def get(self, key: str, *, default: Any = None) -> Any:
         """Returns the value for the given key."""
+        if isinstance(key, int):
+            return self._values[key]
+
+        if self._index is None:
+            self._build_index()
+
         try:
-            return self[key]
-        except KeyError:
+            index = self._index.get(key)
+        except TypeError:
+            # Unhashable keys can't name a field.
+            return default
+        if index is None or key in self._dups:
             return default
+        return self._values[index]
 
-    def keys(self) -> List[str]:
+    def keys(self) -> Tuple[str, ...]:
         """Returns the keys of the record."""
         return self._keys
 
-    def values(self) -> List[Any]:
+    def values(self) -> Tuple[Any, ...]:
         """Returns the values of the record"""
         return self._values
 
+    def _build_index(self):
+        """Builds the key -> index lookup table, remembering which keys appear more than once."""
+        self._index, self._dups = _index_keys(self._keys)
+
     def __dir__(self) -> List[str]:
         standard = dir(super(Record, self))
         return sorted(standard + [str(k) for k in self.keys()])
 
     def __eq__(self, other):
         if not isinstance(other, Record):
-            return False
+            return NotImplemented
 
-        return self._keys == other._keys and self._values == other._values
+        # Records from the same query share their keys, so the identity check usually settles it.
+        return (self._keys is other._keys or self._keys == other._keys) and self._values == other._values
 
     def __getattr__(self, key: str) -> Any:
         try:
@@ -69,36 +93,45 @@ class Record:
             return self.values()[key]
 
         # Default to string-index based lookup.
-        if key in self.keys():
-            if self.keys().count(key) > 1:
-                raise KeyError(f"Record contains multiple '{key}' fields.")
+        if self._index is None:
+            self._build_index()
+
+        try:
+            index = self._index.get(key)
+        except TypeError:
+            # Unhashable keys (e.g. slices) can't name a field.
+            index = None
+        if index is None:
+            raise KeyError(f"Record contains no '{key}' field.")
 
-            index = self.keys().index(key)
-            return self.values()[index]
+        if key in self._dups:
+            raise KeyError(f"Record contains multiple '{key}' fields.")
 
-        raise KeyError(f"Record contains no '{key}' field.")
+        return self._values[index]
 
     def __repr__(self):
-        items = ", ".join([f"{key}={value}" for key, value in self.dict(ordered=True).items()])
+        items = ", ".join(f"{key}={value!r}" for key, value in zip(self._keys, self._values))
         return f"<Record ({items})>"
 
 
 class Collection:
     """The collection of record results from a db query."""
-    __slots__ = ("_rows", "_all_rows", "pending")
+    __slots__ = ("_rows", "_all_rows", "_dataset_cache", "pending")
 
     def __init__(self, rows: Iterator[Record]):
         self._rows = rows
         self._all_rows = []
+        self._dataset_cache = None
         self.pending = True
 
     def all(self, as_dict: bool = False, ordered: bool = False) -> List[Dict[str, Any]]:
         """Returns a list of all rows in the Collection. If they haven't been fetched yet, consume the iterator and
-        cache the results. Setting as_dict to True will return the rows as dicts instead of Records. Setting ordered
-        will set the ordered flag on Record.dict()."""
+        cache the results. Setting as_dict to True will return the rows as dicts instead of Records. The ordered
+        flag is passed on to Record.dict(), which ignores it."""
 
-        # By calling list it calls the __iter__ method
-        rows = list(self)
+        # Once every row is cached, copy the cache instead of walking it through __iter__. The copy keeps callers
+        # from modifying the cache. Otherwise calling list uses the __iter__ method, which fetches the remaining rows.
+        rows = list(self._all_rows) if not self.pending else list(self)
 
         if as_dict:
             return [r.dict(ordered=ordered) for r in rows]
@@ -108,20 +141,23 @@ class Collection:
     @property
     def dataset(self) -> Dataset:
         """Returns a tablib.Dataset for the collection."""
-        ds = Dataset()
-
-        # If we have an empty Collection, return the empty set. By calling list, we are consuming the iterator.
-        if len(list(self)) == 0:
-            return ds
-
-        # Set the column names as headers on Tablib Dataset.
-        ds.headers = self[0].keys()
-
-        for record in self.all():
-            record = _dt_to_str(record.values())
-            ds.append(record)
-
-        return ds
+        rows = self.all()
+
+        # If we have an empty Collection, return the empty set.
+        if not rows:
+            return Dataset()
+
+        # Build the Dataset in one go, using the column names as headers. The constructor doesn't check row widths the
+        # way Dataset.append does, so do it here.
+        headers = rows[0].keys()
+        width = len(headers)
+        data = []
+        for record in rows:
+            values = record.values()
+            if len(values) != width:
+                raise InvalidDimensions
+            data.append(_dt_to_str(values))
+        return Dataset(*data, headers=headers)
 
     def dict(self, *, ordered: bool = False) -> List[Dict[str, Any]]:
         """Returns all records as dictionaries. Despite the misleading name, the result should be a list. The naming is
@@ -130,7 +166,11 @@ class Collection:
 
     def export(self, format: str, **kwargs) -> Any:
         """Exports the the Collection to the given format. (Thanks tablib!)"""
-        return self.dataset.export(format, **kwargs)
+        # Building the dataset drains the Collection, so it can be reused for every subsequent export. It's kept
+        # private since callers are free to modify the Dataset returned by the dataset property.
+        if self._dataset_cache is None:
+            self._dataset_cache = self.dataset
+        return self._dataset_cache.export(format, **kwargs)
 
     def first(self, *, default: Any = None, as_dict: bool = False, ordered: bool = False) -> Any:
         """Returns a single Record from the Collection. It will be the first result (not including headers). If there
@@ -156,29 +196,60 @@ class Collection:
         result in the Collection. If there are no results, `default` will be returned. If default is an instance or
         subclass of an exception, then it will be raised instead of returning it."""
         try:
-            self[1]
+            record = self[0]
         except IndexError:
-            return self.first(default=default, as_dict=as_dict, ordered=ordered)
-        else:
+            if _is_exception(default):
+                raise default
+            return default
+
+        # Probe the underlying iterator for a second row, unless one is already cached.
+        if len(self._all_rows) == 1 and self.pending:
+            try:
+                self._all_rows.append(next(self._rows))
+            except StopIteration:
+                self.pending = False
+
+        if len(self._all_rows) > 1:
             raise ValueError("Collection contains more than one row, exactly one row expected.")
 
+        if as_dict:
+            return record.dict(ordered=ordered)
+
+        return record
+
     def scalar(self, *, default: Any = None) -> Any:
         """Returns the first column of the first record or `default`."""
         record = self.one()
-        return record[0] if record else default
+        return record._values[0] if record is not None else default
 
     def __getitem__(self, key: Union[str, int]) -> Any:
         is_int = isinstance(key, int)
 
+        # Fast paths for the common single row cases: the row is already cached, or it's the next one to fetch.
+        if is_int and key >= 0:
+            cached = len(self._all_rows)
+            if key < cached:
+                return self._all_rows[key]
+            if key == cached:
+                try:
+                    return self.__next__()
+                except StopIteration:
+                    raise IndexError("Collection index out of range") from None
+
         # Convert Collection[1] into slice.
         if is_int:
             key = slice(key, key + 1)
 
-        while len(self) < key.stop or key.stop is None:
+        # Fetch rows up to the slice stop (or every remaining row when unbounded), tracking the count locally.
+        target = float('inf') if key.stop is None else key.stop
+        cached = len(self._all_rows)
+        while self.pending and cached < target:
             try:
-                next(self)
+                self._all_rows.append(next(self._rows))
             except StopIteration:
+                self.pending = False
                 break
+            cached += 1
 
         rows = self._all_rows[key]
         if is_int:
@@ -188,11 +259,13 @@ class Collection:
 
     def __iter__(self):
         """Iterate over all records, consuming the underlying generator when necessary."""
+        # The cache is grown in place by __next__, so this reference always sees newly fetched rows.
+        cached = self._all_rows
         i = 0
         while True:
             # Other code may have run between the yields, so check the cache.
-            if i < len(self):
-                yield self[i]
+            if i < len(cached):
+                yield cached[i]
             else:
                 # Throws StopIteration when done.
                 # Prevent StopIteration bubbling from generator, following https://www.python.org/dev/peps/pep-0479/
@@ -229,10 +302,27 @@ def _is_exception(obj) -> bool:
     return False
 
 
-def _dt_to_str(row: List[Any]) -> Tuple[Any]:
-    """Receives a row, converts datetimes to strings."""
-    row = list(row)
-    for i in range(len(row)):
-        if hasattr(row[i], 'isoformat'):
-            row[i] = row[i].isoformat()
-    return tuple(row)
+def _index_keys(keys: Tuple[str, ...]) -> Tuple[Dict[str, int], Set[str]]:
+    """Maps each key to its first index, and collects the set of keys which appear more than once."""
+    index = {}
+    dups = set()
+    for i, key in enumerate(keys):
+        if key in index:
+            dups.add(key)
+        else:
+            index[key] = i
+    return index, dups
+
+
+def _records(keys: Iterable[str], rows: Iterable[Any]) -> Iterator[Record]:
+    """Yields a Record for each row. Every Record shares the same keys tuple and key -> index lookup table, so the
+    table is only built once per result set."""
+    keys = tuple(keys)
+    index, dups = _index_keys(keys)
+    for row in rows:
+        yield Record(keys, row, _index=index, _dups=dups)
+
+
+def _dt_to_str(row: Iterable[Any]) -> Tuple[Any, ...]:
+    """Receives a row, converts dates, times and datetimes to strings."""
+    return tuple(v.isoformat() if isinstance(v, _DT_TYPES) else v for v in row)
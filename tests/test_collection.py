@@ -1,5 +1,7 @@
+from datetime import datetime
 
 from pytest import raises
+from tablib import InvalidDimensions
 
 from levyt import Collection, Record
 
@@ -50,6 +52,30 @@ def test_collection_slice_iter():
     assert len(rows) == 10
 
 
+def test_collection_unbounded_slice():
+    rows = Collection(Record(['id'], [i]) for i in range(10))
+    for i, row in enumerate(rows[2:], start=2):
+        check_id(i, row)
+    assert len(rows) == 10
+    assert not rows.pending
+
+
+def test_collection_getitem():
+    rows = Collection(Record(['id'], [i]) for i in range(3))
+    check_id(1, rows[1])
+    check_id(0, rows[0])
+    check_id(2, rows[2])
+    with raises(IndexError):
+        rows[3]
+    assert not rows.pending
+
+
+def test_collection_returns_cached_records():
+    rows = Collection(Record(['id'], [i]) for i in range(3))
+    assert rows[0] is rows[0]
+    assert rows.all()[1] is list(rows)[1]
+
+
 # all
 
 def test_collection_all_returns_a_list_of_records():
@@ -57,6 +83,14 @@ def test_collection_all_returns_a_list_of_records():
     assert rows.all() == [Record(['id'], [0]), Record(['id'], [1]), Record(['id'], [2])]
 
 
+def test_collection_all_returns_a_copy():
+    rows = Collection(Record(['id'], [i]) for i in range(3))
+    rows.all().clear()
+    assert len(rows.all()) == 3
+    rows.all().clear()
+    assert len(rows.all()) == 3
+
+
 # first
 
 def test_collection_first_returns_a_single_record():
@@ -106,6 +140,18 @@ def test_collection_one_raises_when_more_than_one():
     raises(ValueError, rows.one)
 
 
+def test_collection_one_raises_when_more_than_one_cached():
+    rows = Collection(Record(['id'], [i]) for i in range(3))
+    rows.all()
+    raises(ValueError, rows.one)
+
+
+def test_collection_one_as_dict():
+    rows = Collection(Record(['id'], [i]) for i in range(1))
+    assert rows.one(as_dict=True) == {'id': 0}
+    assert not rows.pending
+
+
 def test_collection_one_raises_default_if_its_an_exception_subclass():
     rows = Collection(iter([]))
     raises(Exception, rows.first, default=Exception)
@@ -136,3 +182,37 @@ def test_collection_scalar_default_is_overridable():
 def test_collection_scalar_raises_when_more_than_one():
     rows = Collection(Record(['id'], [i]) for i in range(3))
     raises(ValueError, rows.scalar)
+
+
+# dataset
+
+def test_collection_dataset():
+    rows = Collection(Record(['id', 'name'], [i, str(i)]) for i in range(3))
+    ds = rows.dataset
+    assert ds.headers == ['id', 'name']
+    assert ds[:] == [(0, '0'), (1, '1'), (2, '2')]
+
+
+def test_collection_dataset_mixed_column_types():
+    values = [None, datetime(2021, 3, 4, 5, 6), 'spam']
+    rows = Collection(Record(['value'], [v]) for v in values)
+    assert rows.dataset[:] == [(None,), ('2021-03-04T05:06:00',), ('spam',)]
+
+
+def test_collection_export_multiple_formats():
+    rows = Collection(Record(['id'], [i]) for i in range(2))
+    assert rows.export('csv') == 'id\r\n0\r\n1\r\n'
+    assert rows.export('json') == '[{"id": 0}, {"id": 1}]'
+    rows.dataset.append((2,))
+    assert rows.export('csv') == 'id\r\n0\r\n1\r\n'
+
+
+def test_collection_dataset_ragged_rows():
+    rows = Collection(iter([Record(['a', 'b'], [1, 2]), Record(['a'], [3])]))
+    with raises(InvalidDimensions):
+        rows.dataset
+
+
+def test_collection_dataset_empty():
+    rows = Collection(iter([]))
+    assert rows.dataset.height == 0
@@ -1,4 +1,8 @@
 import pytest
+from sqlalchemy import exc
+
+from levyt import Database
+from levyt.database import _text
 
 
 @pytest.mark.usefixtures('foo_table')
@@ -37,10 +41,11 @@ def test_failing_transaction_self_managed(db):
 
 @pytest.mark.usefixtures('foo_table')
 def test_failing_transaction(db):
-    with db.transaction() as conn:
-        conn.query('INSERT INTO foo VALUES (42)')
-        conn.query('INSERT INTO foo VALUES (43)')
-        raise ValueError()
+    with pytest.raises(ValueError):
+        with db.transaction() as conn:
+            conn.query('INSERT INTO foo VALUES (42)')
+            conn.query('INSERT INTO foo VALUES (43)')
+            raise ValueError()
     assert db.query('SELECT COUNT(*) AS n FROM foo')[0].n == 0
 
 
@@ -66,3 +71,43 @@ def test_passing_transaction(db):
 @pytest.mark.usefixtures('foo_table')
 def test_getting_tables(db):
     assert db.tables() == ['foo']
+
+
+def test_getting_tables_sees_new_tables(db):
+    assert db.tables() == []
+    db.execute('CREATE TABLE bar (b integer)')
+    try:
+        assert db.tables() == ['bar']
+    finally:
+        db.execute('DROP TABLE bar')
+    assert db.tables() == []
+
+
+@pytest.mark.usefixtures('foo_table')
+def test_query_records_share_keys(db):
+    db.execute('INSERT INTO foo VALUES (42)')
+    db.execute('INSERT INTO foo VALUES (43)')
+    first, second = db.query('SELECT a FROM foo').all()
+    assert first.keys() is second.keys()
+    assert first.values() == (42,)
+    assert (first.a, second.a) == (42, 43)
+
+
+def test_closed_db_raises():
+    db = Database("sqlite:///:memory:")
+    db.close()
+    with pytest.raises(exc.ResourceClosedError):
+        db.query('SELECT 1')
+    with pytest.raises(exc.ResourceClosedError):
+        db.execute('SELECT 1')
+
+
+@pytest.mark.usefixtures('foo_table')
+def test_repeated_parametric_query(db):
+    db.execute('INSERT INTO foo VALUES (42)')
+    db.execute('INSERT INTO foo VALUES (43)')
+    query = 'SELECT COUNT(*) AS n FROM foo WHERE a=:a'
+    assert db.query(query, a=42).scalar() == 1
+    assert db.query(query, a=43).scalar() == 1
+    assert db.query(query, a=44).scalar() == 0
+    assert _text(query) is _text(query)
@@ -1,3 +1,4 @@
+from datetime import date, datetime, time
 
 from levyt import Record
 
@@ -18,4 +19,46 @@ def test_record_duplicate_column():
     keys, values = ['id', 'name', 'email', 'email'], [1, '', '', '']
     record = Record(keys, values)
     with raises(KeyError):
-        record['email']
\ No newline at end of file
+        record['email']
+
+
+def test_record_getitem_by_key():
+    record = Record(['id', 'name'], [1, 'spam'])
+    assert record['name'] == 'spam'
+    assert record.name == 'spam'
+    with raises(KeyError):
+        record['email']
+    with raises(KeyError):
+        record[1:2]
+
+
+def test_record_get():
+    record = Record(['id', 'email', 'email'], [1, '', ''])
+    assert record.get('id') == 1
+    assert record.get('name', default='eggs') == 'eggs'
+    assert record.get('email') is None
+    assert record.get(['id']) is None
+
+
+def test_record_eq():
+    assert Record(['id', 'name'], [1, 'spam']) == Record(('id', 'name'), [1, 'spam'])
+    assert Record(['id', 'name'], [1, 'spam']) != Record(['id', 'email'], [1, 'spam'])
+    assert Record(['id'], [1]) != (1,)
+
+
+def test_record_dataset_converts_datetimes():
+    record = Record(['d', 'dt', 't', 'n'], [date(2021, 3, 4), datetime(2021, 3, 4, 5, 6), time(7, 8), 1])
+    assert record.dataset[0] == ('2021-03-04', '2021-03-04T05:06:00', '07:08:00', 1)
+
+
+def test_record_repr():
+    assert repr(Record(['id', 'name'], [1, 'spam'])) == "<Record (id=1, name='spam')>"
+
+
+def test_record_dict_returns_a_fresh_dict():
+    record = Record(['id', 'name'], [1, 'spam'])
+    d = record.dict()
+    d['extra'] = 1
+    d.pop('id')
+    assert record.dict() == {'id': 1, 'name': 'spam'}
+    assert record.dict() is not record.dict()